@@ -0,0 +1,695 @@
+"""
+Offline benchmark suite for the graph enumerators, condition factories, filter closures,
+samplers and JSON loaders.
+
+Every benchmark records wall time, peak (traced) memory and throughput, and the results are
+written out as JSON so that two runs can be compared to flag regressions.
+
+Typical use:
+
+    python benchmarks/cbnx_benchmarks.py run -o before.json
+    # ... make a change ...
+    python benchmarks/cbnx_benchmarks.py run -o after.json
+    python benchmarks/cbnx_benchmarks.py compare before.json after.json
+
+The "quick" profile finishes in under a minute. The "full" profile covers the sizes we care about
+in production (every subgraph of the 4 node complete graph, the first 2^16 candidate subgraphs of
+the 5 node one, up to 10^7 samples) and takes much longer.
+"""
+
+import argparse
+import datetime
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from itertools import islice
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if REPO_ROOT not in sys.path:
+    sys.path.insert(0, REPO_ROOT)
+
+import networkx as nx
+from networkx.readwrite import json_graph
+
+import cbnx
+from cbnx import batch_sampling, instrumentation, roles, startup, structure_mcmc
+from sampling_code_with_comments import node_prop_list
+
+BENCHMARKS = []
+
+
+def benchmark(name, group, params):
+    """
+    Registers a benchmark.
+
+    The decorated function takes a single parameter value and returns a zero-argument callable,
+    anything done before returning the callable is setup and is not timed.
+    The callable performs the timed work and returns the number of items it processed
+    (graphs, samples, evaluations...), which is used to compute throughput.
+
+    Variables:
+    name is a unique name for the benchmark
+    group is one of "enumeration", "conditions", "filters", "roles", "sampling", "io" or "startup"
+    params is a dictionary mapping profile names to the list of parameter values to run
+    """
+    def register(func):
+        BENCHMARKS.append({"name": name, "group": group, "params": params, "setup": func})
+        return func
+    return register
+
+
+def _subgraph_sample(nodes, n_graphs):
+    """
+    Returns the first n_graphs subgraphs of completeDiGraph(nodes), in enumeration order.
+    This gives the condition benchmarks a fixed, reproducible input set.
+    """
+    G = cbnx.completeDiGraph(nodes)
+    graphs = []
+    for edges in islice(cbnx.powerset(G.edges()), n_graphs):
+        G_test = G.copy()
+        G_test.remove_edges_from(edges)
+        graphs.append(G_test)
+    return graphs
+
+
+def _node_names(n):
+    return ["n{}".format(i) for i in range(n)]
+
+
+def _sprinkler_graph():
+    G = nx.DiGraph()
+    G.add_nodes_from(node_prop_list)
+    for child, attributes in node_prop_list:
+        G.add_edges_from([(parent, child) for parent in attributes["parents"]])
+    return G
+
+
+def _adjacency_json(n):
+    G = cbnx.completeDiGraph(_node_names(n))
+    for i, (u, v) in enumerate(G.edges()):
+        G[u][v]["id"] = i
+    return json.dumps(json_graph.adjacency_data(G))
+
+
+### Enumeration
+
+# completeDiGraph(5) has 2^25 edge subsets, so at 5 nodes the enumerators only get the first
+# ENUMERATION_CAP candidate subsets, and the parameter says so (e.g. "5/cap=65536").
+# Smaller graphs are enumerated in full.
+ENUMERATION_CAP = 2 ** 16
+ENUMERATION_SIZES = {"quick": [3], "full": [3, 4, "5/cap={}".format(ENUMERATION_CAP)]}
+
+
+def _enumeration_size(param):
+    """
+    Returns (n, cap) for an enumeration parameter: the number of nodes, and the number of candidate
+    edge subsets to enumerate, None for all of them.
+    """
+    if isinstance(param, int):
+        return param, None
+    n, cap = param.split("/cap=")
+    return int(n), int(cap)
+
+
+class _CandidateCapReached(Exception):
+    pass
+
+
+def _capped_conditions(condition_list, cap):
+    """
+    Returns condition_list with a condition in front that stops the enumeration after cap candidate
+    subgraphs, so a capped run always checks the same candidates whatever the other conditions' pass rate.
+    The counter is part of the returned list, so build a new one for every run.
+    """
+    if cap is None:
+        return condition_list
+    checked = [0]
+
+    def candidate_cap_condition(G):
+        checked[0] += 1
+        if checked[0] > cap:
+            raise _CandidateCapReached()
+        return True
+    return [candidate_cap_condition] + list(condition_list)
+
+
+def _count_graphs(graph_set):
+    """
+    Returns the number of graphs in graph_set, counting up to the point a candidate cap was reached.
+    """
+    count = 0
+    try:
+        for _ in graph_set:
+            count += 1
+    except _CandidateCapReached:
+        pass
+    return count
+
+
+@benchmark("powerset.complete_digraph_edges", "enumeration", ENUMERATION_SIZES)
+def bench_powerset(param):
+    n, cap = _enumeration_size(param)
+    edges = cbnx.completeDiGraph(_node_names(n)).edges()
+
+    def run():
+        return sum(1 for _ in islice(cbnx.powerset(edges), cap))
+    return run
+
+
+@benchmark("conditionalSubgraphs.path_complete", "enumeration", ENUMERATION_SIZES)
+def bench_conditional_subgraphs(param):
+    n, cap = _enumeration_size(param)
+    nodes = _node_names(n)
+    G = cbnx.completeDiGraph(nodes)
+    conditions = [cbnx.create_path_complete_condition([(nodes[0], nodes[-1])])]
+
+    def run():
+        return _count_graphs(cbnx.conditionalSubgraphs(G, _capped_conditions(conditions, cap)))
+    return run
+
+
+@benchmark("conditionalSubgraphs.path_complete.instrumented", "enumeration", ENUMERATION_SIZES)
+def bench_conditional_subgraphs_instrumented(param):
+    n, cap = _enumeration_size(param)
+    nodes = _node_names(n)
+    G = cbnx.completeDiGraph(nodes)
+    conditions = [cbnx.create_path_complete_condition([(nodes[0], nodes[-1])])]
+
+    def run():
+        with instrumentation.collect_metrics():
+            return _count_graphs(cbnx.conditionalSubgraphs(G, _capped_conditions(conditions, cap)))
+    return run
+
+
+@benchmark("partialConditionalSubgraphs.self_loops", "enumeration", ENUMERATION_SIZES)
+def bench_partial_conditional_subgraphs(param):
+    n, cap = _enumeration_size(param)
+    nodes = _node_names(n)
+    G = cbnx.completeDiGraph(nodes)
+    edge_set = G.selfloop_edges()
+    conditions = [cbnx.create_path_complete_condition([(nodes[0], nodes[-1])])]
+
+    def run():
+        return _count_graphs(
+            cbnx.partialConditionalSubgraphs(G, edge_set, _capped_conditions(conditions, cap)))
+    return run
+
+
+@benchmark("new_conditional_graph_set.dag", "enumeration", {"quick": [3], "full": [3, 4]})
+def bench_new_conditional_graph_set(n):
+    nodes = _node_names(n)
+    G = cbnx.completeDiGraph(nodes)
+    dag_condition = [cbnx.create_is_dag_condition(nodes)]
+
+    def run():
+        graph_set = cbnx.conditionalSubgraphs(G, [cbnx.create_no_self_loops_condition()])
+        graph_set, dags = cbnx.new_conditional_graph_set(graph_set, dag_condition)
+        return _count_graphs(dags)
+    return run
+
+
+MCMC_STEPS = 10000
+
+
+@benchmark("structure_mcmc.dag", "enumeration", {"quick": [5], "full": [5, 6, 8]})
+def bench_structure_mcmc(n):
+    nodes = _node_names(n)
+    G = cbnx.filter_Graph(cbnx.completeDiGraph(nodes), [cbnx.extract_remove_self_loops_filter()])
+    conditions = [cbnx.create_is_dag_condition(nodes), cbnx.create_no_input_node_condition(nodes[:1])]
+
+    def run():
+        structure_mcmc.run_chain(G, conditions, MCMC_STEPS, seed=0)
+        return MCMC_STEPS
+    return run
+
+
+### Conditions
+
+CONDITION_GRAPHS = {"quick": [2000], "full": [2000, 20000]}
+
+
+def _condition_benchmark(name, factory):
+    @benchmark("condition." + name, "conditions", CONDITION_GRAPHS)
+    def bench(n_graphs):
+        nodes = _node_names(4)
+        graphs = _subgraph_sample(nodes, n_graphs)
+        condition = factory(nodes)
+
+        def run():
+            for graph in graphs:
+                condition(graph)
+            return len(graphs)
+        return run
+    return bench
+
+
+_condition_benchmark(
+    "path_complete", lambda nodes: cbnx.create_path_complete_condition([(nodes[0], nodes[-1])]))
+_condition_benchmark(
+    "no_input_node", lambda nodes: cbnx.create_no_input_node_condition(nodes[:2]))
+_condition_benchmark(
+    "is_dag", lambda nodes: cbnx.create_is_dag_condition(nodes))
+_condition_benchmark(
+    "no_self_loops", lambda nodes: cbnx.create_no_self_loops_condition())
+_condition_benchmark(
+    "explicit_parent",
+    lambda nodes: cbnx.create_explicit_parent_condition([(nodes[-1], nodes[:2])]))
+_condition_benchmark(
+    "explicit_child",
+    lambda nodes: cbnx.create_explicit_child_condition([(nodes[0], nodes[1:3])]))
+_condition_benchmark(
+    "no_direct_arrows",
+    lambda nodes: cbnx.create_no_direct_arrows_condition([(nodes[0], nodes[-1])]))
+_condition_benchmark(
+    "no_output_node", lambda nodes: cbnx.create_no_output_node_condition(nodes[-2:]))
+
+
+### Filters
+
+FILTER_SIZES = {"quick": [4, 8], "full": [4, 8, 16, 32]}
+FILTER_REPEATS = 200
+
+
+def _filter_stack(nodes):
+    return [
+        cbnx.extract_remove_self_loops_filter(),
+        cbnx.orphan_nodes_filter(nodes[:1]),
+        cbnx.barren_nodes_filter(nodes[-1:]),
+        cbnx.extract_remove_inward_edges_filter([(nodes[-2], nodes[:2])]),
+        cbnx.extract_remove_outward_edges_filter([(nodes[1], nodes[2:4])]),
+    ]
+
+
+def _filter_benchmark(name, make_filter):
+    @benchmark("filter." + name, "filters", FILTER_SIZES)
+    def bench(n):
+        nodes = _node_names(n)
+        G = cbnx.completeDiGraph(nodes)
+        graph_filter = make_filter(nodes)
+
+        def run():
+            for _ in range(FILTER_REPEATS):
+                graph_filter(G)
+            return FILTER_REPEATS
+        return run
+    return bench
+
+
+_filter_benchmark("remove_self_loops", lambda nodes: cbnx.extract_remove_self_loops_filter())
+_filter_benchmark(
+    "remove_inward_edges",
+    lambda nodes: cbnx.extract_remove_inward_edges_filter([(nodes[-1], nodes[:2]), (nodes[0], [])]))
+_filter_benchmark(
+    "remove_outward_edges",
+    lambda nodes: cbnx.extract_remove_outward_edges_filter([(nodes[0], nodes[1:3]), (nodes[-1], [])]))
+_filter_benchmark("barren_nodes", lambda nodes: cbnx.barren_nodes_filter(nodes[-2:]))
+_filter_benchmark("orphan_nodes", lambda nodes: cbnx.orphan_nodes_filter(nodes[:2]))
+_filter_benchmark(
+    "filter_Graph.stack",
+    lambda nodes: (lambda G, stack=_filter_stack(nodes): cbnx.filter_Graph(G, stack)))
+
+
+@benchmark("filter_graph_set.stack", "filters", CONDITION_GRAPHS)
+def bench_filter_graph_set(n_graphs):
+    nodes = _node_names(4)
+    graphs = _subgraph_sample(nodes, n_graphs)
+    stack = _filter_stack(nodes)
+
+    def run():
+        return sum(1 for _ in cbnx.filter_graph_set(graphs, stack))
+    return run
+
+
+@benchmark("edge_removal_bitmask.stack", "filters", FILTER_SIZES)
+def bench_edge_removal_bitmask(n):
+    nodes = _node_names(n)
+    edges = cbnx.completeDiGraph(nodes).edges()
+    stack = _filter_stack(nodes)
+
+    def run():
+        for _ in range(FILTER_REPEATS):
+            cbnx.edge_removal_bitmask(stack, edges)
+        return FILTER_REPEATS
+    return run
+
+
+### Edge classification by node role
+
+ROLE_NODES = ["A int", "B int", "C★", "D★", "E out", "F out"]
+
+
+def _role_graphs(n_graphs):
+    G = cbnx.completeDiGraph(ROLE_NODES)
+    edges = G.edges()
+    graphs = []
+    for i in range(n_graphs):
+        H = G.copy()
+        # a fixed, varied selection of edges per graph
+        H.remove_edges_from([edge for j, edge in enumerate(edges) if (i * 7 + j * 13) % 5 < 2])
+        graphs.append(H)
+    return graphs
+
+
+@benchmark("edge_classifiers.string_scan", "roles", CONDITION_GRAPHS)
+def bench_edge_classifiers(n_graphs):
+    graphs = _role_graphs(n_graphs)
+
+    def run():
+        for graph in graphs:
+            cbnx.intervention_effects(graph)
+            cbnx.cause_observation_pairings(graph)
+            cbnx.hidden_cause_pairs(graph)
+        return len(graphs)
+    return run
+
+
+@benchmark("edge_classifiers.role_index", "roles", CONDITION_GRAPHS)
+def bench_edge_classifiers_role_index(n_graphs):
+    graphs = _role_graphs(n_graphs)
+
+    def run():
+        role_index = roles.NodeRoleIndex(ROLE_NODES)
+        for graph in graphs:
+            cbnx.intervention_effects(graph, role_index)
+            cbnx.cause_observation_pairings(graph, role_index)
+            cbnx.hidden_cause_pairs(graph, role_index)
+        return len(graphs)
+    return run
+
+
+@benchmark("group_by_edge_class.hidden_cause", "roles", CONDITION_GRAPHS)
+def bench_group_by_edge_class(n_graphs):
+    graphs = _role_graphs(n_graphs)
+
+    def run():
+        roles.group_by_edge_class(graphs, "hidden_cause")
+        return len(graphs)
+    return run
+
+
+### Sampling
+
+SAMPLE_SIZES = {"quick": [10**3, 10**4], "full": [10**3, 10**4, 10**5, 10**6, 10**7]}
+
+
+@benchmark("sample_from_graph.sprinkler", "sampling", SAMPLE_SIZES)
+def bench_sample_from_graph(k):
+    G = _sprinkler_graph()
+
+    def run():
+        cbnx.sample_from_graph(G, k=k)
+        return k * G.number_of_nodes()
+    return run
+
+
+GRAPH_SET_SIZES = {"quick": [20, 200], "full": [20, 200, 2000]}
+GRAPH_SET_SAMPLES = 1000
+
+
+def _sprinkler_graph_set(n_graphs):
+    G = _sprinkler_graph()
+    graphs = []
+    for i in range(n_graphs):
+        H = G.copy()
+        # four different rain parameterizations, so some families are shared and some are not
+        H.node["rain"]["distribution"] = [.2 + .1 * (i % 4), .8 - .1 * (i % 4)]
+        graphs.append(H)
+    return graphs
+
+
+@benchmark("sample_from_graph.graph_set", "sampling", {"quick": [20], "full": [20, 200]})
+def bench_sample_from_graph_graph_set(n_graphs):
+    graphs = _sprinkler_graph_set(n_graphs)
+
+    def run():
+        for G in graphs:
+            cbnx.sample_from_graph(G, k=GRAPH_SET_SAMPLES)
+        return n_graphs * GRAPH_SET_SAMPLES * 3
+    return run
+
+
+def _sample_graph_set_benchmark(name, n_jobs):
+    @benchmark(name, "sampling", GRAPH_SET_SIZES)
+    def bench(n_graphs):
+        graphs = _sprinkler_graph_set(n_graphs)
+
+        def run():
+            batch_sampling.sample_graph_set(graphs, k=GRAPH_SET_SAMPLES, seed=0, n_jobs=n_jobs)
+            return n_graphs * GRAPH_SET_SAMPLES * 3
+        return run
+    return bench
+
+
+_sample_graph_set_benchmark("sample_graph_set", 1)
+_sample_graph_set_benchmark("sample_graph_set.process_pool", 2)
+
+
+### JSON loaders
+
+JSON_SIZES = {"quick": [8, 16], "full": [8, 16, 32, 64]}
+JSON_REPEATS = 20
+
+
+@benchmark("clean_json_adj_loads", "io", JSON_SIZES)
+def bench_clean_json_adj_loads(n):
+    json_str = _adjacency_json(n)
+
+    def run():
+        for _ in range(JSON_REPEATS):
+            cbnx.clean_json_adj_loads(json_str)
+        return JSON_REPEATS
+    return run
+
+
+@benchmark("clean_json_adj_load", "io", JSON_SIZES)
+def bench_clean_json_adj_load(n):
+    json_str = _adjacency_json(n)
+    handle, file_name = tempfile.mkstemp(suffix=".json")
+    with os.fdopen(handle, "w") as f:
+        f.write(json_str)
+
+    def run():
+        for _ in range(JSON_REPEATS):
+            cbnx.clean_json_adj_load(file_name)
+        return JSON_REPEATS
+    run.cleanup = lambda: os.remove(file_name)
+    return run
+
+
+### Worker startup
+
+STARTUP_MODULES = {
+    "sampling": ["cbnx.sampling"],
+    "io": ["cbnx.io"],
+    "enumeration": ["cbnx.enumeration", "cbnx.conditions", "cbnx.filters"],
+}
+
+
+@benchmark("worker_startup", "startup", {"quick": sorted(STARTUP_MODULES), "full": sorted(STARTUP_MODULES)})
+def bench_worker_startup(kind):
+    def run():
+        startup.measure_worker_startup(STARTUP_MODULES[kind], n_workers=2)
+        return 2
+    return run
+
+
+### Running and comparing
+
+def _measure(run, repeat):
+    """
+    Times `repeat` calls of run, then makes one more call under tracemalloc for peak memory.
+    Tracing slows Python code down considerably, so it is kept out of the timed calls.
+    """
+    times = []
+    items = 0
+    for _ in range(repeat):
+        start = time.perf_counter()
+        items = run()
+        times.append(time.perf_counter() - start)
+
+    tracemalloc.start()
+    try:
+        run()
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+    median = statistics.median(times)
+    return {
+        "repeat": repeat,
+        "items": items,
+        "wall_time_min": min(times),
+        "wall_time_median": median,
+        "wall_times": times,
+        "peak_memory_bytes": peak,
+        "throughput_per_sec": items / median if median > 0 else None,
+    }
+
+
+def _metadata(profile):
+    try:
+        commit = subprocess.check_output(
+            ["git", "rev-parse", "HEAD"], cwd=REPO_ROOT, stderr=subprocess.DEVNULL
+        ).decode().strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    try:
+        import numpy
+        numpy_version = numpy.__version__
+    except ImportError:
+        numpy_version = None
+    return {
+        "timestamp": datetime.datetime.now().isoformat(),
+        "profile": profile,
+        "git_commit": commit,
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "networkx": nx.__version__,
+        "numpy": numpy_version,
+    }
+
+
+def run_benchmarks(profile="quick", name_filter=None, group=None, repeat=3, stream=sys.stdout):
+    """
+    Runs every registered benchmark for the given profile and returns the results as a dictionary
+    that can be serialised as JSON.
+
+    A benchmark that raises is recorded with its error instead of stopping the whole suite.
+
+    Variables:
+    profile is "quick" or "full"
+    name_filter is a substring that benchmark names must contain to be run
+    group restricts the run to one benchmark group
+    repeat is the number of timed calls per benchmark and parameter value
+    """
+    results = []
+    for bench in BENCHMARKS:
+        if name_filter is not None and name_filter not in bench["name"]:
+            continue
+        if group is not None and bench["group"] != group:
+            continue
+        for param in bench["params"].get(profile, []):
+            record = {"name": bench["name"], "group": bench["group"], "param": param}
+            try:
+                run = bench["setup"](param)
+                try:
+                    record.update(_measure(run, repeat))
+                finally:
+                    getattr(run, "cleanup", lambda: None)()
+            except Exception as e:
+                record["error"] = "{}: {}".format(type(e).__name__, e)
+            results.append(record)
+            if stream is not None:
+                stream.write(_format_record(record) + "\n")
+                stream.flush()
+    return {"metadata": _metadata(profile), "results": results}
+
+
+def _format_record(record):
+    label = "{}[{}]".format(record["name"], record["param"])
+    if "error" in record:
+        return "{:<52} ERROR {}".format(label, record["error"])
+    return "{:<52} {:>10.4f}s {:>12.1f}/s {:>10.1f}KiB".format(
+        label, record["wall_time_median"], record["throughput_per_sec"] or 0,
+        record["peak_memory_bytes"] / 1024)
+
+
+def _key(record):
+    return (record["name"], json.dumps(record["param"], sort_keys=True))
+
+
+# peak memory changes smaller than this are noise from the interpreter, not from our code
+MEMORY_NOISE_BYTES = 64 * 1024
+
+
+def compare_results(base, new, threshold=0.1):
+    """
+    Compares two benchmark runs and returns a list of rows, one for each benchmark present in both.
+
+    A row is flagged as a regression when the median wall time or the peak memory of the
+    new run exceeds the base run by more than threshold (a fraction, 0.1 is 10%),
+    and as an improvement when it is lower by more than threshold.
+    Memory changes below MEMORY_NOISE_BYTES are ignored.
+
+    Variables:
+    base and new are results dictionaries as returned by run_benchmarks
+    threshold is the relative change that is considered significant
+    """
+    base_records = {_key(r): r for r in base["results"] if "error" not in r}
+    rows = []
+    for record in new["results"]:
+        old = base_records.get(_key(record))
+        if old is None or "error" in record:
+            continue
+        time_ratio = record["wall_time_median"] / old["wall_time_median"]
+        memory_ratio = (record["peak_memory_bytes"] / old["peak_memory_bytes"]
+                        if old["peak_memory_bytes"] else 1.0)
+        if abs(record["peak_memory_bytes"] - old["peak_memory_bytes"]) < MEMORY_NOISE_BYTES:
+            memory_ratio = 1.0
+        if time_ratio > 1 + threshold or memory_ratio > 1 + threshold:
+            status = "regression"
+        elif time_ratio < 1 - threshold or memory_ratio < 1 - threshold:
+            status = "improvement"
+        else:
+            status = "unchanged"
+        rows.append({
+            "name": record["name"],
+            "param": record["param"],
+            "time_ratio": time_ratio,
+            "memory_ratio": memory_ratio,
+            "status": status,
+        })
+    return rows
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    commands = parser.add_subparsers(dest="command")
+
+    run_parser = commands.add_parser("run", help="run the benchmarks")
+    run_parser.add_argument("--profile", choices=["quick", "full"], default="quick")
+    run_parser.add_argument("--filter", dest="name_filter", default=None,
+                            help="only run benchmarks whose name contains this string")
+    run_parser.add_argument("--group", default=None,
+                            choices=sorted(set(b["group"] for b in BENCHMARKS)))
+    run_parser.add_argument("--repeat", type=int, default=3)
+    run_parser.add_argument("-o", "--output", default=None, help="write JSON results here")
+
+    compare_parser = commands.add_parser("compare", help="compare two JSON result files")
+    compare_parser.add_argument("base")
+    compare_parser.add_argument("new")
+    compare_parser.add_argument("--threshold", type=float, default=0.1)
+
+    args = parser.parse_args(argv)
+
+    if args.command == "run":
+        results = run_benchmarks(args.profile, args.name_filter, args.group, args.repeat)
+        if args.output is not None:
+            with open(args.output, "w") as f:
+                json.dump(results, f, indent=2)
+        return 1 if any("error" in r for r in results["results"]) else 0
+
+    if args.command == "compare":
+        with open(args.base) as f:
+            base = json.load(f)
+        with open(args.new) as f:
+            new = json.load(f)
+        rows = compare_results(base, new, args.threshold)
+        for row in rows:
+            print("{:<52} time x{:<8.3f} memory x{:<8.3f} {}".format(
+                "{}[{}]".format(row["name"], row["param"]),
+                row["time_ratio"], row["memory_ratio"], row["status"]))
+        return 1 if any(row["status"] == "regression" for row in rows) else 0
+
+    parser.print_help()
+    return 2
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,190 @@
+"""
+Checks that the compiled filters give the same graphs as the original per-filter chain.
+
+filter_Graph compiles its filters (see cbnx.filters.compile_filters) and edge_removal_bitmask
+applies them to edge bitmasks without building graphs. This script builds random graphs and
+random filter stacks, including opaque filters that are not made by the extract_remove_* factories,
+and compares the results against the chain implementation the filters had before they were compiled,
+which is kept below as the reference.
+
+    python benchmarks/check_filter_equivalence.py --trials 3000
+
+It prints the first mismatching stack and exits with a non-zero status if any check fails.
+"""
+
+import argparse
+import os
+import random
+import sys
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if REPO_ROOT not in sys.path:
+    sys.path.insert(0, REPO_ROOT)
+
+import networkx as nx
+
+from cbnx import filters
+
+
+# The original chain implementation: every filter copies its input graph and filter_Graph applies them in turn.
+
+def reference_filter_Graph(G,filter_set):
+    graph = G.copy()
+    for f in filter_set:
+        graph = f(graph)
+    return graph
+
+def reference_remove_self_loops_filter():
+    def remove_self_loops_filter(G):
+        graph = G.copy()
+        graph.remove_edges_from(graph.selfloop_edges())
+        return graph
+    return remove_self_loops_filter
+
+def reference_remove_inward_edges_filter(exceptions_from_removal):
+    def remove_inward_edges_filter(G):
+        graph = G.copy()
+        list_of_children = [x[0] for x in exceptions_from_removal if len(x[1]) > 0]
+        list_of_orphans = [x[0] for x in exceptions_from_removal if len(x[1]) == 0]
+
+        for orphan in list_of_orphans:
+            graph.remove_edges_from([edge for edge in graph.edges() if edge[1] == orphan])
+
+        for child in list_of_children:
+            current_edges = graph.in_edges(child)
+            valid_edges = [(y,x[0]) for x in exceptions_from_removal if x[0] == child  for y in x[1]]
+            graph.remove_edges_from([edge for edge in current_edges if edge not in valid_edges])
+
+        return graph
+    return remove_inward_edges_filter
+
+def reference_remove_outward_edges_filter(exceptions_from_removal):
+    def remove_outward_edges_filter(G):
+        graph = G.copy()
+        list_of_parents = [x[0] for x in exceptions_from_removal if len(x[1]) > 0]
+        list_of_barrens = [x[0] for x in exceptions_from_removal if len(x[1]) == 0]
+
+        for barren in list_of_barrens:
+            graph.remove_edges_from([edge for edge in graph.edges() if edge[0] == barren])
+
+        for parent in list_of_parents:
+            current_edges = graph.out_edges(parent)
+            valid_edges = [(x[0],y) for x in exceptions_from_removal if x[0] == parent for y in x[1]]
+            graph.remove_edges_from([edge for edge in current_edges if edge not in valid_edges])
+
+        return graph
+    return remove_outward_edges_filter
+
+
+# (reference factory, cbnx factory) for every kind of filter in a random stack
+FILTER_KINDS = {
+    "self_loops": (lambda args: reference_remove_self_loops_filter(),
+                   lambda args: filters.extract_remove_self_loops_filter()),
+    "inward": (reference_remove_inward_edges_filter, filters.extract_remove_inward_edges_filter),
+    "outward": (reference_remove_outward_edges_filter, filters.extract_remove_outward_edges_filter),
+    "orphan": (lambda args: reference_remove_inward_edges_filter([(node, []) for node, _ in args]),
+               lambda args: filters.orphan_nodes_filter([node for node, _ in args])),
+    "barren": (lambda args: reference_remove_outward_edges_filter([(node, []) for node, _ in args]),
+               lambda args: filters.barren_nodes_filter([node for node, _ in args])),
+}
+
+
+def opaque_filter(G):
+    """
+    A filter without an edge_filter_spec, so compile_filters has to apply it in its place in the chain.
+    It removes the first two edges of whatever graph it is given, so it only agrees with the reference
+    if the filters before it have been applied.
+    """
+    graph = G.copy()
+    graph.remove_edges_from(sorted(graph.edges())[:2])
+    return graph
+
+
+def random_graph(rng, max_nodes):
+    nodes = ["x{}".format(i) for i in range(rng.randint(2, max_nodes))]
+    G = nx.DiGraph()
+    G.add_nodes_from(nodes)
+    G.add_edges_from((u, v) for u in nodes for v in nodes if rng.random() < 0.7)
+    return G
+
+
+def random_exceptions(rng, nodes):
+    """
+    Returns a list of (node, [neighbours]) tuples. Nodes may repeat and neighbour lists may be empty.
+    """
+    return [(rng.choice(nodes), rng.sample(nodes, rng.randint(0, min(3, len(nodes)))))
+            for _ in range(rng.randint(1, 3))]
+
+
+def random_stack(rng, nodes, max_filters, opaque_probability):
+    stack = []
+    for _ in range(rng.randint(0, max_filters)):
+        if rng.random() < opaque_probability:
+            stack.append(("opaque", None))
+        else:
+            stack.append((rng.choice(sorted(FILTER_KINDS)), random_exceptions(rng, nodes)))
+    return stack
+
+
+def build_filters(stack, which):
+    return [opaque_filter if kind == "opaque" else FILTER_KINDS[kind][which](args) for kind, args in stack]
+
+
+def same_graph(a, b):
+    return set(a.nodes()) == set(b.nodes()) and set(a.edges()) == set(b.edges())
+
+
+def check_stack(G, stack):
+    """
+    Returns a list of descriptions of the checks that fail for graph G and filter stack.
+    """
+    reference_filters = build_filters(stack, 0)
+    cbnx_filters = build_filters(stack, 1)
+    expected = reference_filter_Graph(G, reference_filters)
+    failures = []
+
+    if not same_graph(filters.filter_Graph(G, cbnx_filters), expected):
+        failures.append("filter_Graph")
+    for (kind, _), reference_filter, cbnx_filter in zip(stack, reference_filters, cbnx_filters):
+        if not same_graph(cbnx_filter(G), reference_filter(G)):
+            failures.append("single {} filter".format(kind))
+    if not same_graph(filters.compile_filters([filters.compile_filters(cbnx_filters)])(G), expected):
+        failures.append("compile_filters of a compiled filter")
+    if not same_graph(list(filters.filter_graph_set([G], cbnx_filters))[0], expected):
+        failures.append("filter_graph_set")
+
+    if all(kind != "opaque" for kind, _ in stack):
+        edge_list = G.edges()
+        mask = filters.edge_removal_bitmask(cbnx_filters, edge_list)
+        kept = set(edge for i, edge in enumerate(edge_list) if not mask >> i & 1)
+        if kept != set(expected.edges()):
+            failures.append("edge_removal_bitmask")
+    return failures
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--trials", type=int, default=3000, help="number of random graphs and filter stacks")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--max-nodes", type=int, default=6)
+    parser.add_argument("--max-filters", type=int, default=5)
+    parser.add_argument("--opaque-probability", type=float, default=0.15,
+                        help="probability that a filter in a stack is opaque")
+    args = parser.parse_args(argv)
+
+    rng = random.Random(args.seed)
+    for trial in range(args.trials):
+        G = random_graph(rng, args.max_nodes)
+        stack = random_stack(rng, G.nodes(), args.max_filters, args.opaque_probability)
+        failures = check_stack(G, stack)
+        if failures:
+            print("trial {} failed: {}".format(trial, ", ".join(failures)))
+            print("graph edges: {}".format(sorted(G.edges())))
+            print("filter stack: {}".format(stack))
+            return 1
+    print("{} random filter stacks match the reference chain".format(args.trials))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,66 @@
+"""
+Causal Bayesian NetworkX: utilities for enumerating, conditioning, filtering and sampling causal graphs.
+
+The package is split into submodules so that workers only pay for what they use:
+
+cbnx.enumeration      complete graphs and conditional subgraph/graph-set generators
+cbnx.conditions       condition factories
+cbnx.filters          filter factories and filter compilation
+cbnx.roles            node-role index and edge classification
+cbnx.sampling         sampling from a single parameterized graph
+cbnx.batch_sampling   batched sampling across a graph set
+cbnx.structure_mcmc   MCMC sampling over conditioned subgraph spaces
+cbnx.io               JSON loaders
+cbnx.instrumentation  opt-in metrics
+cbnx.startup          measuring process-pool worker startup
+
+Importing cbnx itself imports none of them (nor networkx or numpy). The names below are loaded
+from their submodule the first time they are accessed, so e.g. a worker that only uses
+cbnx.sample_from_graph never imports the enumeration machinery.
+"""
+
+import importlib
+
+_SUBMODULES = ("enumeration", "conditions", "filters", "roles", "sampling", "batch_sampling",
+               "structure_mcmc", "io", "instrumentation", "startup")
+
+_EXPORTS = {
+    "enumeration": ["powerset", "completeDiGraph", "partialConditionalSubgraphs", "conditionalSubgraphs",
+                    "new_conditional_graph_set"],
+    "conditions": ["create_path_complete_condition", "create_no_input_node_condition", "create_is_dag_condition",
+                   "create_no_self_loops_condition", "create_no_self_loop_condition",
+                   "create_explicit_parent_condition", "create_explicit_child_condition",
+                   "create_no_direct_arrows_condition", "create_no_output_node_condition"],
+    "filters": ["filter_Graph", "extract_remove_self_loops_filter", "extract_remove_self_loops",
+                "extract_remove_inward_edges_filter", "extract_remove_outward_edges_filter",
+                "barren_nodes_filter", "orphan_nodes_filter", "compile_filters", "edge_removal_bitmask",
+                "filter_graph_set"],
+    "roles": ["NodeRoleIndex", "classify_graph_set_with_index", "group_by_edge_class",
+              "intervention_effects", "cause_observation_pairings", "hidden_cause_pairs"],
+    "sampling": ["sample_from_graph", "check_if_parents_filled", "nodeset_query", "conditional_sampling",
+                 "string_to_sample_function", "print_prob_est"],
+    "batch_sampling": ["sample_graph_set", "decode_samples"],
+    "structure_mcmc": ["run_chain", "sample_structures", "graphs_from_edge_sets"],
+    "io": ["clean_json_adj_load", "clean_json_adj_loads"],
+    "instrumentation": ["Metrics", "collect_metrics", "get_metrics", "set_metrics"],
+    "startup": ["measure_worker_startup"],
+}
+
+_NAME_TO_SUBMODULE = {name: submodule for submodule, names in _EXPORTS.items() for name in names}
+
+__all__ = sorted(_NAME_TO_SUBMODULE)
+
+
+def __getattr__(name):
+    if name in _NAME_TO_SUBMODULE:
+        value = getattr(importlib.import_module("cbnx." + _NAME_TO_SUBMODULE[name]), name)
+    elif name in _SUBMODULES:
+        value = importlib.import_module("cbnx." + name)
+    else:
+        raise AttributeError("module 'cbnx' has no attribute '{}'".format(name))
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__) | set(_SUBMODULES))
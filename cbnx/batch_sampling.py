@@ -0,0 +1,247 @@
+"""
+Batched sampling from every graph of a graph set, e.g. the output of conditionalSubgraphs or
+new_conditional_graph_set.
+
+sample_from_graph rebuilds everything it needs from the node attributes on every call and then
+samples one value at a time. Here each node's family (the node, its parents, their state spaces and
+its distribution) is compiled once into a table of cumulative probabilities, and graphs whose
+families are identical share those tables. Sampling is then done by inverse transform sampling,
+all k samples of a node at once, into an integer array laid out as [graph, node, sample].
+
+The node attributes are read exactly as sample_from_graph reads them
+("state_space", "parents", "distribution" and "sample_function"),
+and every node needs to use the "choice" sample function.
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from cbnx.instrumentation import get_metrics
+
+# Graphs per chunk of work. Each chunk gets its own random stream, so this (and not n_jobs)
+# determines the samples you get for a given seed.
+DEFAULT_CHUNK_SIZE = 64
+
+# compiled families kept by each process-pool worker across the chunks it samples
+_worker_cache = {}
+
+
+def _freeze(value):
+    if isinstance(value, dict):
+        return tuple(sorted((_freeze(key), _freeze(val)) for key, val in value.items()))
+    if isinstance(value, np.ndarray):
+        return _freeze(value.tolist())
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(x) for x in value)
+    return value
+
+
+def family_key(G, node):
+    """
+    Returns a hashable key identifying node's family in G: the node, its state space, its parents
+    and their state spaces, and its distribution.
+    Nodes with equal family keys sample identically, so they can share a compiled table.
+    """
+    attributes = G.node[node]
+    if attributes["sample_function"] != "choice":
+        raise ValueError("""
+        {} uses the sample function {}, only "choice" families can be compiled for batched sampling.
+        Use sample_from_graph for graphs with other sample functions.""".format(node, attributes["sample_function"]))
+    parents = tuple(attributes["parents"])
+    for parent in parents:
+        if parent not in G:
+            raise ValueError("{} is a parent of {} but is not in the graph.".format(parent, node))
+    return (node,
+            tuple(attributes["state_space"]),
+            parents,
+            tuple(tuple(G.node[parent]["state_space"]) for parent in parents),
+            _freeze(attributes["distribution"]))
+
+
+def compile_family(key):
+    """
+    Compiles a family into a dictionary holding
+    "cdf", a [parent configuration, state] array of cumulative probabilities,
+    "missing", a boolean array marking parent configurations that the distribution does not cover, and
+    "radix", the number of states of each parent, used to turn parent values into a configuration index.
+
+    Parent configurations are numbered in mixed radix over the parents in the order of the node's "parents"
+    attribute, with each parent's value given by its position in that parent's state space.
+    """
+    node, state_space, parents, parent_state_spaces, distribution = key
+    radix = [len(states) for states in parent_state_spaces]
+    n_configs = int(np.prod(radix)) if radix else 1
+    probabilities = np.zeros((n_configs, len(state_space)))
+    missing = np.zeros(n_configs, dtype=bool)
+
+    if len(parents) == 0:
+        probabilities[0, :] = distribution
+    else:
+        table = dict(distribution)
+        for config in range(n_configs):
+            codes = np.unravel_index(config, radix)
+            par_val_list = tuple((parent, states[code]) for parent, states, code
+                                 in zip(parents, parent_state_spaces, codes))
+            if par_val_list in table:
+                probabilities[config, :] = table[par_val_list]
+            else:
+                missing[config] = True
+
+    totals = probabilities[~missing].sum(axis=1)
+    if not np.allclose(totals, 1):
+        raise ValueError("The distribution of {} has probabilities that do not sum to 1.".format(node))
+    cdf = np.cumsum(probabilities, axis=1)
+    cdf[:, -1] = 1.0
+    return {"node": node, "cdf": cdf, "missing": missing, "radix": radix, "parents": parents}
+
+
+def _sampling_order(G):
+    """
+    Returns the nodes of G ordered so that every node comes after its parents (per the "parents" attributes).
+    """
+    order = []
+    placed = set()
+    remaining = list(G.nodes())
+    while remaining:
+        ready = [node for node in remaining if set(G.node[node]["parents"]) <= placed]
+        if len(ready) == 0:
+            raise ValueError("The parents attributes of {} form a cycle.".format(remaining))
+        order.extend(ready)
+        placed.update(ready)
+        remaining = [node for node in remaining if node not in placed]
+    return order
+
+
+def compile_graph(G, nodes, cache, counts=None):
+    """
+    Returns the sampling plan for G: a list of (node position, parent positions, compiled family)
+    in sampling order, where positions index into nodes.
+    Compiled families are looked up in (and added to) cache, a dictionary keyed by family_key.
+    If counts is given, its "compiled" and "reused" entries count the families compiled and found in cache.
+    """
+    position = {node: i for i, node in enumerate(nodes)}
+    plan = []
+    for node in _sampling_order(G):
+        key = family_key(G, node)
+        compiled = cache.get(key)
+        if compiled is None:
+            compiled = cache[key] = compile_family(key)
+            if counts is not None:
+                counts["compiled"] += 1
+        elif counts is not None:
+            counts["reused"] += 1
+        plan.append((position[node], [position[parent] for parent in compiled["parents"]], compiled))
+    return plan
+
+
+def _sample_plan(plan, out, rng):
+    """
+    Fills out, a [node, sample] integer array, with samples drawn according to plan.
+    """
+    k = out.shape[1]
+    for node_position, parent_positions, compiled in plan:
+        if parent_positions:
+            config = np.ravel_multi_index([out[p] for p in parent_positions], compiled["radix"])
+            if compiled["missing"][config].any():
+                raise KeyError("The distribution of {} has no entry for a parent configuration that was sampled.".format(
+                    compiled["node"]))
+            cdf = compiled["cdf"][config]
+        else:
+            cdf = compiled["cdf"][[0]]
+        u = rng.random(k)
+        out[node_position] = (u[:, None] >= cdf[:, :-1]).sum(axis=1)
+
+
+def _check_node_universe(graphs, nodes):
+    node_set = set(nodes)
+    state_spaces = [None] * len(nodes)
+    for G in graphs:
+        if set(G.nodes()) != node_set:
+            raise ValueError("Every graph in the set needs to have the same nodes for batched sampling.")
+        for i, node in enumerate(nodes):
+            states = tuple(G.node[node]["state_space"])
+            if state_spaces[i] is None:
+                state_spaces[i] = states
+            elif state_spaces[i] != states:
+                raise ValueError("{} has different state spaces in different graphs of the set.".format(node))
+    return state_spaces
+
+
+def _sample_chunk(graphs, nodes, k, dtype, seed_sequence, cache=None):
+    """
+    Samples a chunk of graphs, and returns the [graph, node, sample] array together with the counts of
+    families compiled and reused (see compile_graph). The counts are returned rather than recorded here,
+    since in a process-pool worker the active metrics are the worker's copy and never reach the caller.
+    """
+    if cache is None:
+        cache = _worker_cache
+    rng = np.random.default_rng(seed_sequence)
+    out = np.empty((len(graphs), len(nodes), k), dtype=dtype)
+    counts = {"compiled": 0, "reused": 0}
+    for i, G in enumerate(graphs):
+        plan = compile_graph(G, nodes, cache, counts)
+        _sample_plan(plan, out[i], rng)
+    return out, counts
+
+
+def sample_graph_set(graph_set, k=1, nodes=None, seed=None, n_jobs=1, chunk_size=DEFAULT_CHUNK_SIZE, cache=None):
+    """
+    Samples k values of every node from every graph in graph_set.
+
+    Returns a tuple (samples, nodes, state_spaces), where
+    samples is an integer array of shape [graph, node, sample],
+    nodes gives the node at each position of the node axis, and
+    state_spaces[i] is the state space of nodes[i], so that samples[g, i, j] is an index into it.
+
+    Variables:
+    graph_set is an iterable of parameterized graphs that share the same nodes (it is consumed).
+    k is the number of samples per graph.
+    nodes fixes the order of the node axis, it defaults to the node order of the first graph.
+    seed seeds the random streams, the same seed and chunk_size give the same samples whatever n_jobs is.
+    n_jobs is the number of worker processes to spread chunks of graphs across, 1 samples in this process.
+    chunk_size is the number of graphs per chunk of work.
+    cache is a dictionary of compiled families to reuse across calls (only used when n_jobs is 1).
+    """
+    graphs = list(graph_set)
+    if nodes is None:
+        nodes = graphs[0].nodes() if graphs else []
+    nodes = list(nodes)
+    state_spaces = _check_node_universe(graphs, nodes)
+    max_states = max([len(states) for states in state_spaces] + [1])
+    dtype = np.promote_types(np.min_scalar_type(max_states - 1), np.uint8)
+    if cache is None:
+        cache = {}
+
+    chunks = [graphs[i:i + chunk_size] for i in range(0, len(graphs), chunk_size)]
+    seed_sequences = np.random.SeedSequence(seed).spawn(len(chunks))
+
+    if n_jobs == 1 or len(chunks) <= 1:
+        results = [_sample_chunk(chunk, nodes, k, dtype, seed_sequence, cache)
+                   for chunk, seed_sequence in zip(chunks, seed_sequences)]
+    else:
+        with ProcessPoolExecutor(max_workers=n_jobs) as executor:
+            results = list(executor.map(
+                _sample_chunk, chunks, [nodes] * len(chunks), [k] * len(chunks),
+                [dtype] * len(chunks), seed_sequences))
+
+    metrics = get_metrics()
+    if metrics is not None:
+        metrics.incr("sample_graph_set.graphs", len(graphs))
+        metrics.incr("sample_graph_set.samples", len(graphs) * len(nodes) * k)
+        for _, counts in results:
+            metrics.incr("sample_graph_set.families.compiled", counts["compiled"])
+            metrics.incr("sample_graph_set.families.reused", counts["reused"])
+
+    if len(results) == 0:
+        return np.empty((0, len(nodes), k), dtype=dtype), nodes, state_spaces
+    return np.concatenate([samples for samples, _ in results]), nodes, state_spaces
+
+
+def decode_samples(samples, nodes, state_spaces, graph_index):
+    """
+    Returns the samples of one graph as a dictionary mapping each node to an array of its sampled states,
+    which is the form sample_from_graph returns.
+    """
+    return {node: np.asarray(states)[samples[graph_index, i]]
+            for i, (node, states) in enumerate(zip(nodes, state_spaces))}
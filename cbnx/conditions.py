@@ -0,0 +1,98 @@
+"""
+Condition factories. Each factory returns a closure that takes a graph and returns whether the graph meets the condition,
+to be passed in the condition lists of conditionalSubgraphs, new_conditional_graph_set and sample_structures.
+"""
+
+import networkx as nx
+
+# Each condition made by the factories below carries a condition_spec attribute, a (kind, arguments) tuple
+# that says declaratively what the condition checks. structure_mcmc uses it to check a proposed edge move
+# against the condition incrementally instead of re-running the condition on the whole graph.
+# For explicit_parent and explicit_child the arguments are only the constrained nodes,
+# since a graph that meets the condition can't gain or lose any edge at those nodes and still meet it.
+
+def create_path_complete_condition(transmit_node_pairs):
+    """
+    This creates a closure that takes a graph as its input and returns a boolean value indicating whether the pairs of nodes in transmit_node_pairs are able to communicate from each tuple in transmit_node_pairs such that there is a path from transmit_node_pairs[i][0] to transmit_node_pairs[i][1]
+    """
+
+    def path_complete_condition(G):
+        return all([nx.has_path(G,x,y) for x,y in transmit_node_pairs])
+    path_complete_condition.condition_spec = ("path_complete", [tuple(pair) for pair in transmit_node_pairs])
+    return path_complete_condition
+
+def create_no_input_node_condition(node_list):
+    """
+    This factory allows us to specify that no directed can be directed into a set of nodes.
+    This returns a function that takes an graph argument (G) and verifies that 
+    none of the nodes in node_list are child nodes. 
+    
+    NB: This is useful for making interventions explicit over a set of graphs.
+    
+    Variables:
+    node_list is a list of nodes that will have no parents
+    """
+    
+    def no_input_node_condition(G):
+        return all([G.in_degree(y)==0 for y in node_list])
+    no_input_node_condition.condition_spec = ("no_input_node", frozenset(node_list))
+    return no_input_node_condition
+
+
+def create_is_dag_condition(node_list):
+    def is_dag_condition(G):
+        return nx.is_directed_acyclic_graph(G)
+    is_dag_condition.condition_spec = ("is_dag", None)
+    return is_dag_condition
+
+
+def create_no_self_loops_condition():
+    """
+    This factory allows us to specify that there are no valid self-loops
+    This returns a function that takes an graph argument (G). 
+    
+    NB: This is a common assumption of causal graphs, because they are not considered to be extended through time.
+    """
+
+    def no_self_loops_condition(G):
+        return not(any([(y,y) in G.edges() for y in G.nodes()]))
+    no_self_loops_condition.condition_spec = ("no_self_loop", None)
+    return no_self_loops_condition
+
+create_no_self_loop_condition = create_no_self_loops_condition
+    
+def create_explicit_parent_condition(parentage_tuple_list):
+    """
+    This states for a child node, what its explicit parents are.
+    """
+    def explicit_parent_condition(G):
+        return all(
+            [sorted(G.in_edges(y[0])) == sorted([(x,y[0]) for x in y[1]]) 
+             for y in parentage_tuple_list])
+    explicit_parent_condition.condition_spec = ("explicit_parent", frozenset(y[0] for y in parentage_tuple_list))
+    return explicit_parent_condition
+
+def create_explicit_child_condition(parentage_tuple_list):
+    """ 
+    This states for a parent node, what its explicit children are.
+    """
+    def explicit_child_condition(G):
+        return all(
+            [sorted(G.out_edges(y[0])) == sorted([(y[0],x) for x in y[1]]) 
+             for y in parentage_tuple_list])
+    explicit_child_condition.condition_spec = ("explicit_child", frozenset(y[0] for y in parentage_tuple_list))
+    return explicit_child_condition
+
+def create_no_direct_arrows_condition(node_pair_list):
+    def no_direct_arrows_condition(G):
+        return not(any([y in G.edges() for y in node_pair_list]))
+    no_direct_arrows_condition.condition_spec = ("no_direct_arrows", frozenset(tuple(pair) for pair in node_pair_list))
+    return no_direct_arrows_condition
+
+def create_no_output_node_condition(node_list):
+    def no_output_node_condition(G):
+        return all([G.out_degree(y)==0 for y in node_list])
+    no_output_node_condition.condition_spec = ("no_output_node", frozenset(node_list))
+    return no_output_node_condition
+
+
@@ -0,0 +1,139 @@
+"""
+Enumerating subgraphs: building complete graphs, and generating the subgraphs of a graph
+(or the graphs of a graph set) that meet a list of conditions (see cbnx.conditions).
+"""
+
+from itertools import chain, combinations, tee
+
+import networkx as nx
+
+from cbnx.instrumentation import get_metrics, instrumented_subgraphs, instrumented_graph_set
+
+def powerset(iterable):
+#    "powerset([1,2,3]) --> () (1,) (2,) (3,) (1,2) (1,3) (2,3) (1,2,3)"
+    s = list(iterable)
+#
+    len_powerset = 0
+    powerset_vals = chain.from_iterable(combinations(s, r) for r in range(len(s)+1))
+    return powerset_vals
+
+
+def completeDiGraph(nodes):
+    """
+    returns a directed graph with all possible edges for a set of nodes
+    
+    Variables:
+    nodes are a list of strings that specify the node names
+    """
+    G = nx.DiGraph() # Creates new graph
+    G.add_nodes_from(nodes) # adds nodes to graph
+    edgelist = list(combinations(nodes,2)) # build list of directed edges
+    edgelist.extend([(y,x) for x,y in list(combinations(nodes,2))]) #add symmetric edges
+    edgelist.extend([(x,x) for x in nodes]) # add self-loops
+    G.add_edges_from(edgelist) # add edges to graph
+    return G
+
+def partialConditionalSubgraphs(G,edge_set,condition_list):
+    try: 
+        condition_list[0]
+    except TypeError:
+        raise TypeError("""
+        Subsampling from a graph requires passing in a list of conditions encoded
+        as first-class functions that accept networkX graphs as an input and return boolean values.""")
+    edge_powerset = powerset(edge_set)
+
+    metrics = get_metrics()
+    if metrics is not None:
+        yield from instrumented_subgraphs(
+            metrics, "partialConditionalSubgraphs", G, edge_powerset, condition_list)
+        return
+
+    for edges in edge_powerset:
+        G_test = G.copy()
+        G_test.remove_edges_from(edges)
+        if all([c(G_test) for c in condition_list]):
+            yield G_test
+
+def conditionalSubgraphs(G,condition_list):
+    """
+    Returns a graph generator/iterator such that any conditions specified in condition_list 
+    are met by some subgraph of G.
+    This is intended to be used in conjunction with completeDiGraph or any graph which subgraphs 
+    are expected to be taken.
+    
+    Variables: 
+    G is a graph from which subgraphs will be taken.
+    condition_list is a list of first order functions that will be applied to filter the subgraphs of G.
+    Functions in condition_list should return a single boolean value for every graph passed into them.
+    """
+
+    try: 
+        condition_list[0]
+    except TypeError:
+        raise TypeError("""
+        Subsampling from a graph requires passing in a list of conditions encoded
+        as first-class functions that accept networkX graphs as an input and return boolean values.""")
+    # edge_powerset = powerset(G.edges())
+
+    metrics = get_metrics()
+    if metrics is not None:
+        yield from instrumented_subgraphs(
+            metrics, "conditionalSubgraphs", G, powerset(G.edges()), condition_list)
+        return
+
+    for edges in powerset(G.edges()):
+        G_test = G.copy()
+        G_test.remove_edges_from(edges)
+        if all([c(G_test) for c in condition_list]):
+            
+            yield G_test
+
+def new_conditional_graph_set(graph_set,condition_list):
+    """
+    This returns a copy of the old graph_set and a new graph generator which has 
+    the conditions in condition_list applied to it.
+    
+    Warning: This function will devour the iterator that you include as the graph_set input, 
+    you need to redeclare the variable as one of the return values of the function.
+    
+    Thus a correct use would be:
+    a,b = new_conditional_graph_set(a,c)
+    
+    The following would not be a correct use:
+    x,y = new_conditional_graph_set(a,c)
+    
+    Variables: 
+    graph_set is a graph-set generator
+    condition_list is a list of first order functions returning boolean values when passed a graph.
+    """
+    
+    try: 
+        condition_list[0]
+    except TypeError:
+        raise TypeError("""
+        Subsampling from a graph requires passing in a list of conditions encoded
+        as first-class functions that accept networkX graphs as an input and return boolean values.""")
+    graph_set_newer, graph_set_test = tee(graph_set,2)
+    def gen():
+        metrics = get_metrics()
+        if metrics is not None:
+            yield from instrumented_graph_set(
+                metrics, "new_conditional_graph_set", graph_set_test, condition_list)
+            return
+        for G in graph_set_test:
+            G_test = G.copy()
+            if all([c(G_test) for c in condition_list]):
+                yield G_test
+    return graph_set_newer, gen()
+
+# def add_edge_attribute(graph,edge,attribute_name,attribute_value):
+#     graph[edge[0]][edge[1]][attribute_name]=attribute_value
+#     pass
+    
+# def add_multiple_edge_attributes(graph,edge_list,attribute_name,attribute_value):
+#     for edge in edge_list:
+#         add_edge_attribute(graph,edge,attribute_name,attribute_value)
+#     pass
+
+# def add_gamma_attribute_values(graph,edge_list,base_rate,scale):
+#     pass
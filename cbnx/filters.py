@@ -0,0 +1,210 @@
+"""
+Filter factories and filter compilation. A filter is a closure that takes a graph and returns a copy of it with some edges removed.
+"""
+
+from collections import namedtuple
+
+def filter_Graph(G,filter_set):
+    """
+    This allows us to apply a set of filters encoded as closures/first-order functions that take a graph as input and return a graph as output.
+
+    The filters are compiled with compile_filters, so a stack of extract_remove_* filters costs a single copy of G.
+    """
+    return compile_filters(filter_set)(G)
+
+# Every filter made by the extract_remove_* factories (and so barren_nodes_filter and orphan_nodes_filter)
+# carries an edge_filter_spec attribute describing which edges it removes:
+#
+# remove_self_loops is whether self-loops are removed
+# allowed_parents maps a node to the frozenset of parents its inward edges may come from
+# allowed_children maps a node to the frozenset of children its outward edges may go to
+#
+# Whether one of these filters removes an edge only depends on the edge itself, so a chain of them
+# removes exactly the edges that any one of them would remove from the original graph.
+# That lets compile_filters merge a filter stack into a single spec and apply it with one copy and one pass.
+_EdgeFilterSpec = namedtuple("_EdgeFilterSpec", ["remove_self_loops", "allowed_parents", "allowed_children"])
+
+def _merge_edge_filter_specs(specs):
+    remove_self_loops = False
+    allowed_parents = {}
+    allowed_children = {}
+    for spec in specs:
+        remove_self_loops = remove_self_loops or spec.remove_self_loops
+        for merged, allowed in [(allowed_parents, spec.allowed_parents), (allowed_children, spec.allowed_children)]:
+            for node, neighbours in allowed.items():
+                merged[node] = merged[node] & neighbours if node in merged else neighbours
+    return _EdgeFilterSpec(remove_self_loops, allowed_parents, allowed_children)
+
+def _edges_removed_by(spec, graph):
+    """
+    Returns the set of edges of graph that spec removes.
+    Only the edges of the nodes named in spec are visited, rather than every edge of graph per node.
+    """
+    removed = set()
+    if spec.remove_self_loops:
+        removed.update(graph.selfloop_edges())
+    for child, parents in spec.allowed_parents.items():
+        if child in graph:
+            removed.update((parent, child) for parent in graph.predecessors(child) if parent not in parents)
+    for parent, children in spec.allowed_children.items():
+        if parent in graph:
+            removed.update((parent, child) for child in graph.successors(parent) if child not in children)
+    return removed
+
+def _spec_removes_edge(spec, edge):
+    parent, child = edge[0], edge[1]
+    return ((spec.remove_self_loops and parent == child)
+            or (child in spec.allowed_parents and parent not in spec.allowed_parents[child])
+            or (parent in spec.allowed_children and child not in spec.allowed_children[parent]))
+
+def extract_remove_self_loops_filter():
+    spec = _EdgeFilterSpec(True, {}, {})
+
+    def remove_self_loops_filter(G):
+        graph = G.copy()
+        graph.remove_edges_from(graph.selfloop_edges()) #this is a networkX method that allows you to automatically grab edges that are self-loops.
+        return graph
+    remove_self_loops_filter.edge_filter_spec = spec
+    return remove_self_loops_filter
+
+extract_remove_self_loops = extract_remove_self_loops_filter
+
+def _allowed_neighbours(exceptions_from_removal):
+    """
+    Turns a list of (node, [neighbours]) tuples into a dictionary mapping each node to the frozenset
+    of neighbours its edges may still connect to.
+    Tuples that share a node are combined, and a node with an empty neighbour list in any tuple
+    keeps none of its edges.
+    """
+    allowed = {}
+    emptied = set()
+    for node, neighbours in exceptions_from_removal:
+        if len(neighbours) == 0:
+            emptied.add(node)
+        allowed[node] = allowed.get(node, frozenset()) | frozenset(neighbours)
+    for node in emptied:
+        allowed[node] = frozenset()
+    return allowed
+
+def extract_remove_inward_edges_filter(exceptions_from_removal):
+    """
+
+    This covers both orphans and explicit_child_parentage.
+    """
+    spec = _EdgeFilterSpec(False, _allowed_neighbours(exceptions_from_removal), {})
+
+    def remove_inward_edges_filter(G):
+        graph = G.copy()
+        graph.remove_edges_from(_edges_removed_by(spec, graph))
+        return graph
+    remove_inward_edges_filter.edge_filter_spec = spec
+    return remove_inward_edges_filter
+
+def extract_remove_outward_edges_filter(exceptions_from_removal):
+    """
+    This creates a closure that goes through the list of tuples to explicitly state which edges are leaving from the first argument of each tuple.
+
+    Each tuple that is passed in has two members. The first member is a string representing a single node from which the children will be explicitly stated. The second member is the list of nodes that are in its child set.
+
+    If the second member is an empty list, all edges leaving the node are removed.
+
+    This covers both barren_nodes and explicit_parent_offspring.
+    """
+    spec = _EdgeFilterSpec(False, {}, _allowed_neighbours(exceptions_from_removal))
+
+    def remove_outward_edges_filter(G):
+        graph = G.copy()
+        graph.remove_edges_from(_edges_removed_by(spec, graph))
+        return graph
+    remove_outward_edges_filter.edge_filter_spec = spec
+    return remove_outward_edges_filter
+
+def barren_nodes_filter(list_of_barren_nodes):
+    """
+    This allows for a nicer syntax for specifying that nodes are barren (that they have no children).
+    """
+
+    new_list = [(node,[]) for node in list_of_barren_nodes]
+    return extract_remove_outward_edges_filter(new_list)
+
+
+def orphan_nodes_filter(list_of_orphan_nodes):
+    """
+    This allows for a nicer syntax for specifying that nodes are orphans (that they have no parents).
+
+    """
+
+    new_list = [(node,[]) for node in list_of_orphan_nodes]
+    return extract_remove_inward_edges_filter(new_list)
+
+def compile_filters(filter_set):
+    """
+    Compiles a list of filters into a single filter that gives the same graph as applying them in order,
+    i.e., compile_filters(filter_set)(G) is equivalent to filter_Graph(G, filter_set) in the original chain form.
+
+    Consecutive filters made by the extract_remove_* factories are merged into one edge-removal step,
+    so the graph is copied once rather than once per filter.
+    Any other filter (a closure without an edge_filter_spec) is applied as it is, in its place in the chain.
+    If every filter could be merged, the compiled filter has an edge_filter_spec itself, so it can be compiled again.
+
+    Variables:
+    filter_set is a list of filters encoded as closures that take a graph as input and return a graph as output.
+    """
+    stages = []
+    for f in filter_set:
+        spec = getattr(f, "edge_filter_spec", None)
+        if spec is None:
+            stages.append(f)
+        elif stages and isinstance(stages[-1], _EdgeFilterSpec):
+            stages[-1] = _merge_edge_filter_specs([stages[-1], spec])
+        else:
+            stages.append(spec)
+
+    def compiled_filter(G):
+        graph = G.copy()
+        for stage in stages:
+            if isinstance(stage, _EdgeFilterSpec):
+                graph.remove_edges_from(_edges_removed_by(stage, graph))
+            else:
+                graph = stage(graph)
+        return graph
+
+    if len(stages) == 0:
+        compiled_filter.edge_filter_spec = _EdgeFilterSpec(False, {}, {})
+    elif len(stages) == 1 and isinstance(stages[0], _EdgeFilterSpec):
+        compiled_filter.edge_filter_spec = stages[0]
+    return compiled_filter
+
+def edge_removal_bitmask(filter_set, edge_list):
+    """
+    Returns an integer whose i-th bit is set if the filters in filter_set remove edge_list[i].
+
+    This lets a filter stack be applied to edge sets encoded as bitmasks over a fixed edge ordering
+    (e.g. G.edges()) with `edge_bits & ~mask`, without building any graphs.
+    Every filter in filter_set needs to come from the extract_remove_* factories (or compile_filters),
+    since the effect of any other filter cannot be known without running it.
+    """
+    specs = []
+    for f in filter_set:
+        spec = getattr(f, "edge_filter_spec", None)
+        if spec is None:
+            raise ValueError("""
+            {} is not a declarative edge filter, only filters made by the extract_remove_* factories
+            can be turned into an edge mask.""".format(getattr(f, "__name__", f)))
+        specs.append(spec)
+    spec = _merge_edge_filter_specs(specs)
+    mask = 0
+    for i, edge in enumerate(edge_list):
+        if _spec_removes_edge(spec, edge):
+            mask |= 1 << i
+    return mask
+
+def filter_graph_set(graph_set, filter_set):
+    """
+    Returns a generator that applies the filters in filter_set to every graph in graph_set.
+    The filters are compiled once for the whole set, rather than once per graph.
+    """
+    compiled_filter = compile_filters(filter_set)
+    for G in graph_set:
+        yield compiled_filter(G)
+
@@ -0,0 +1,206 @@
+"""
+Opt-in instrumentation for the graph enumerators, conditions and samplers.
+Nothing is recorded unless a Metrics object is active (see set_metrics and collect_metrics).
+"""
+
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+
+_active_metrics = None
+
+
+class Metrics(object):
+    """
+    Collects counters and timers from instrumented code and forwards them to optional callbacks.
+
+    Counter and timer names are dotted strings that begin with the name of the instrumented
+    function, e.g. "conditionalSubgraphs.candidates" or
+    "conditionalSubgraphs.condition.0.path_complete_condition.rejected".
+
+    Variables:
+    callback is called as callback(kind, name, value) for every recorded value, where kind is
+        "counter" or "timer", which is where you would plug in a metrics exporter.
+    progress_callback is called as progress_callback(name, progress_dict) from long-running
+        generators every progress_every candidates, and once more when they finish.
+    progress_every is the number of candidates between calls to progress_callback.
+    """
+
+    def __init__(self, callback=None, progress_callback=None, progress_every=1000):
+        self.callback = callback
+        self.progress_callback = progress_callback
+        self.progress_every = progress_every
+        self.reset()
+
+    def reset(self):
+        self.counters = defaultdict(int)
+        self.timers = defaultdict(float)
+        self.timer_counts = defaultdict(int)
+
+    def incr(self, name, n=1):
+        self.counters[name] += n
+        if self.callback is not None:
+            self.callback("counter", name, n)
+
+    def add_time(self, name, seconds):
+        self.timers[name] += seconds
+        self.timer_counts[name] += 1
+        if self.callback is not None:
+            self.callback("timer", name, seconds)
+
+    @contextmanager
+    def timer(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add_time(name, time.perf_counter() - start)
+
+    def progress(self, name, **values):
+        if self.progress_callback is not None:
+            self.progress_callback(name, values)
+
+    def snapshot(self):
+        """
+        Returns a plain dictionary copy of everything recorded so far.
+        Timers are reported as total seconds together with the number of timed calls.
+        """
+        return {
+            "counters": dict(self.counters),
+            "timers": {name: {"total": total, "count": self.timer_counts[name]}
+                       for name, total in self.timers.items()},
+        }
+
+
+def get_metrics():
+    """
+    Returns the active Metrics object, or None when instrumentation is off.
+    """
+    return _active_metrics
+
+
+def set_metrics(metrics):
+    """
+    Activates metrics (or deactivates instrumentation if metrics is None) and returns the
+    previously active Metrics object.
+    """
+    global _active_metrics
+    previous = _active_metrics
+    _active_metrics = metrics
+    return previous
+
+
+@contextmanager
+def collect_metrics(metrics=None):
+    """
+    Activates metrics for the duration of the with-block and yields it.
+    A new Metrics object is created if none is passed in.
+
+    NB: Generators look up the active metrics when they start running, not when they are created,
+    so consume instrumented generators inside the with-block.
+    """
+    if metrics is None:
+        metrics = Metrics()
+    previous = set_metrics(metrics)
+    try:
+        yield metrics
+    finally:
+        set_metrics(previous)
+
+
+def condition_name(condition, position):
+    """
+    Returns the name used for a condition in metric names: its position in the condition list
+    followed by the name of the closure returned by the condition factory (e.g. "0.path_complete_condition").
+    The position keeps two conditions made by the same factory from sharing a counter.
+    """
+    return "{}.{}".format(position, getattr(condition, "__name__", type(condition).__name__))
+
+
+def evaluate_conditions(metrics, prefix, condition_list, G):
+    """
+    Instrumented equivalent of `all([c(G) for c in condition_list])`.
+
+    Every condition is still evaluated, and for each one we record its evaluation time and
+    whether it rejected G under "<prefix>.condition.<condition name>.(time|rejected)" (see condition_name).
+    """
+    passed = True
+    for position, c in enumerate(condition_list):
+        name = "{}.condition.{}".format(prefix, condition_name(c, position))
+        start = time.perf_counter()
+        result = c(G)
+        metrics.add_time(name + ".time", time.perf_counter() - start)
+        if not result:
+            metrics.incr(name + ".rejected")
+            passed = False
+    return passed
+
+
+def timed_copy(metrics, prefix, G):
+    """
+    Returns G.copy(), recording the time it took under "<prefix>.copy".
+    """
+    start = time.perf_counter()
+    G_copy = G.copy()
+    metrics.add_time(prefix + ".copy", time.perf_counter() - start)
+    return G_copy
+
+
+def record_node_samples(metrics, prefix, node, k, seconds):
+    """
+    Records that k samples were drawn for node in the given number of seconds, under
+    "<prefix>.samples" and "<prefix>.node.<node>.(samples|time)".
+    Samples/sec per node is the ratio of the node's samples counter to its time.
+    """
+    metrics.incr(prefix + ".samples", k)
+    metrics.incr("{}.node.{}.samples".format(prefix, node), k)
+    metrics.add_time("{}.node.{}.time".format(prefix, node), seconds)
+
+
+def instrumented_subgraphs(metrics, prefix, G, edge_sets, condition_list):
+    """
+    Instrumented body of the subgraph enumerators.
+    For every set of edges in edge_sets this yields the copy of G with those edges removed
+    if it meets every condition in condition_list, recording candidates, acceptances,
+    copy time and per-condition rejections and times, and reporting progress.
+    """
+    start = time.perf_counter()
+    candidates = 0
+    accepted = 0
+    for edges in edge_sets:
+        candidates += 1
+        G_test = timed_copy(metrics, prefix, G)
+        G_test.remove_edges_from(edges)
+        metrics.incr(prefix + ".candidates")
+        if evaluate_conditions(metrics, prefix, condition_list, G_test):
+            accepted += 1
+            metrics.incr(prefix + ".accepted")
+            yield G_test
+        if candidates % metrics.progress_every == 0:
+            metrics.progress(prefix, candidates=candidates, accepted=accepted,
+                             elapsed=time.perf_counter() - start, done=False)
+    metrics.progress(prefix, candidates=candidates, accepted=accepted,
+                     elapsed=time.perf_counter() - start, done=True)
+
+
+def instrumented_graph_set(metrics, prefix, graph_set, condition_list):
+    """
+    Instrumented body of new_conditional_graph_set's generator,
+    which yields copies of the graphs in graph_set that meet every condition in condition_list.
+    """
+    start = time.perf_counter()
+    candidates = 0
+    accepted = 0
+    for G in graph_set:
+        candidates += 1
+        G_test = timed_copy(metrics, prefix, G)
+        metrics.incr(prefix + ".candidates")
+        if evaluate_conditions(metrics, prefix, condition_list, G_test):
+            accepted += 1
+            metrics.incr(prefix + ".accepted")
+            yield G_test
+        if candidates % metrics.progress_every == 0:
+            metrics.progress(prefix, candidates=candidates, accepted=accepted,
+                             elapsed=time.perf_counter() - start, done=False)
+    metrics.progress(prefix, candidates=candidates, accepted=accepted,
+                     elapsed=time.perf_counter() - start, done=True)
@@ -0,0 +1,23 @@
+"""
+Loading graphs saved in networkX's JSON adjacency format.
+"""
+
+import json
+
+from networkx.readwrite import json_graph
+
+def clean_json_adj_load(file_name):
+    with open(file_name) as d:
+        json_data = json.load(d)
+    H = json_graph.adjacency_graph(json_data)
+    for edge_here in H.edges():
+        del(H[edge_here[0]][edge_here[1]]["id"])
+    return H
+
+def clean_json_adj_loads(json_str):
+    json_data = json.loads(json_str)
+    H = json_graph.adjacency_graph(json_data)
+    for edge_here in H.edges():
+        del(H[edge_here[0]][edge_here[1]]["id"])
+    return H
+
@@ -0,0 +1,214 @@
+"""
+A node-role index for the node-naming conventions used in our causal graphs,
+and bulk classification of edges across whole graph sets.
+
+Node roles are read off node name suffixes:
+"int" marks an intervention node, "★" a (possibly hidden) cause and "out" an observation.
+Edges are then classified by the roles of their endpoints:
+
+intervention edges go out of intervention nodes (see intervention_effects)
+cause_observation edges go from causes to observations (see cause_observation_pairings)
+hidden_cause edges go from causes to causes (see hidden_cause_pairs)
+
+The suffixes are checked once per node when the index is built, so classifying edges afterwards
+is a set lookup per edge, and classifying a graph set is done with boolean numpy arrays.
+
+numpy is only imported by the functions that use it, so the edge classifiers can be imported without it.
+"""
+
+ROLE_SUFFIXES = {"intervention": "int", "cause": "★", "observation": "out"}
+
+EDGE_CLASSES = {
+    "intervention": lambda roles_from, roles_to: "intervention" in roles_from,
+    "cause_observation": lambda roles_from, roles_to: "cause" in roles_from and "observation" in roles_to,
+    "hidden_cause": lambda roles_from, roles_to: "cause" in roles_from and "cause" in roles_to,
+}
+
+
+def node_roles(node):
+    """
+    Returns the frozenset of roles (keys of ROLE_SUFFIXES) whose suffix the node name ends with.
+    Nodes that are not strings have no roles.
+    """
+    if not isinstance(node, str):
+        return frozenset()
+    return frozenset(role for role, suffix in ROLE_SUFFIXES.items() if node.endswith(suffix))
+
+
+class NodeRoleIndex(object):
+    """
+    Maps every node of a node universe to its roles, and every ordered pair of those nodes
+    (every possible edge) to its edge classes.
+
+    Edges are numbered in row-major order over the node list,
+    i.e. the edge (nodes[i], nodes[j]) has index i*len(nodes) + j,
+    and that numbering is used for the columns of the arrays returned by edge_vector and classify_graph_set.
+
+    Variables:
+    nodes is the node universe, e.g. G.nodes() for the graph that the graphs of a set are subgraphs of.
+    """
+
+    def __init__(self, nodes):
+        import numpy as np
+
+        self.nodes = list(nodes)
+        self.node_index = {node: i for i, node in enumerate(self.nodes)}
+        self.roles = {node: node_roles(node) for node in self.nodes}
+
+        n = len(self.nodes)
+        self.class_masks = {}
+        self.class_edges = {}
+        self._class_edge_sets = {}
+        for edge_class, in_class in EDGE_CLASSES.items():
+            mask = np.zeros(n * n, dtype=bool)
+            for i, u in enumerate(self.nodes):
+                for j, v in enumerate(self.nodes):
+                    mask[i * n + j] = in_class(self.roles[u], self.roles[v])
+            self.class_masks[edge_class] = mask
+            self.class_edges[edge_class] = [self.edge_from_index(k) for k in np.flatnonzero(mask)]
+            self._class_edge_sets[edge_class] = frozenset(self.class_edges[edge_class])
+
+    @classmethod
+    def from_graph(cls, G):
+        return cls(G.nodes())
+
+    @property
+    def n_edges(self):
+        return len(self.nodes) ** 2
+
+    def nodes_with_role(self, role):
+        return [node for node in self.nodes if role in self.roles[node]]
+
+    def edge_index(self, edge):
+        try:
+            return self.node_index[edge[0]] * len(self.nodes) + self.node_index[edge[1]]
+        except KeyError as e:
+            raise ValueError("{} is not a node of this role index.".format(e.args[0]))
+
+    def edge_from_index(self, k):
+        i, j = divmod(int(k), len(self.nodes))
+        return (self.nodes[i], self.nodes[j])
+
+    def edge_classes_of(self, edge):
+        """
+        Returns the list of edge classes that edge belongs to.
+        """
+        return [edge_class for edge_class in EDGE_CLASSES if self._in_class(edge, edge_class)]
+
+    def _in_class(self, edge, edge_class):
+        """
+        Returns whether edge is in edge_class. Edges between indexed nodes are a set lookup,
+        edges with a node outside the index fall back to reading the roles off the node names,
+        so the answer never depends on which nodes the index was built from.
+        """
+        if edge[0] in self.node_index and edge[1] in self.node_index:
+            return edge in self._class_edge_sets[edge_class]
+        return EDGE_CLASSES[edge_class](self.roles[edge[0]] if edge[0] in self.roles else node_roles(edge[0]),
+                                        self.roles[edge[1]] if edge[1] in self.roles else node_roles(edge[1]))
+
+    def edges_of_class(self, graph, edge_class):
+        """
+        Returns the edges of graph in edge_class, in the order of graph.edges().
+        """
+        return [x for x in graph.edges() if self._in_class(x, edge_class)]
+
+    def edge_vector(self, graph):
+        """
+        Returns a boolean array over the edge universe that is True for the edges of graph.
+        """
+        import numpy as np
+
+        vector = np.zeros(self.n_edges, dtype=bool)
+        vector[[self.edge_index(edge) for edge in graph.edges()]] = True
+        return vector
+
+    def incidence_matrix(self, graph_set):
+        """
+        Returns a boolean [graph, edge] array whose rows are the edge vectors of the graphs in graph_set.
+        graph_set may be a generator, it is only iterated over once.
+        """
+        import numpy as np
+
+        rows = [self.edge_vector(graph) for graph in graph_set]
+        if len(rows) == 0:
+            return np.zeros((0, self.n_edges), dtype=bool)
+        return np.vstack(rows)
+
+    def classify_graph_set(self, graph_set):
+        """
+        Classifies the edges of every graph in graph_set at once.
+
+        Returns a dictionary with the [graph, edge] incidence matrix under "incidence",
+        and for every edge class a boolean [graph, class edge] array saying which of the class's edges
+        each graph contains. The columns of the array for edge_class are labelled by class_edges[edge_class].
+        """
+        incidence = self.incidence_matrix(graph_set)
+        classification = {"incidence": incidence}
+        for edge_class, mask in self.class_masks.items():
+            classification[edge_class] = incidence[:, mask]
+        return classification
+
+
+def classify_graph_set_with_index(graph_set, role_index=None):
+    """
+    Returns the role index used and the result of role_index.classify_graph_set(graph_set).
+    If no role_index is passed in, one is built from the nodes of every graph in graph_set.
+    """
+    graphs = list(graph_set)
+    if role_index is None:
+        nodes = []
+        seen = set()
+        for graph in graphs:
+            nodes.extend(node for node in graph.nodes() if node not in seen)
+            seen.update(graph.nodes())
+        role_index = NodeRoleIndex(nodes)
+    return role_index, role_index.classify_graph_set(graphs)
+
+
+def group_by_edge_class(graph_set, edge_class="hidden_cause", role_index=None):
+    """
+    Groups the graphs in graph_set by which edges of edge_class they contain,
+    e.g. by hidden-cause structure with the default edge_class.
+
+    Returns a tuple (structures, group_ids, class_edges), where
+    structures is a boolean [group, class edge] array with one row per distinct structure,
+    group_ids gives for each graph (in the order of graph_set) the row of structures it has, and
+    class_edges labels the columns of structures.
+
+    Variables:
+    graph_set is an iterable of graphs
+    edge_class is one of the keys of EDGE_CLASSES
+    role_index is a NodeRoleIndex covering the nodes of every graph, one is built if it is not passed in
+    (a graph with a node outside role_index raises ValueError)
+    """
+    import numpy as np
+
+    role_index, classification = classify_graph_set_with_index(graph_set, role_index)
+    class_matrix = classification[edge_class]
+    if class_matrix.shape[0] == 0:
+        return class_matrix, np.zeros(0, dtype=int), role_index.class_edges[edge_class]
+    structures, group_ids = np.unique(class_matrix, axis=0, return_inverse=True)
+    return structures, group_ids.reshape(-1), role_index.class_edges[edge_class]
+
+
+# The edge classifiers below take an optional NodeRoleIndex for the graph's node universe.
+# When you classify many graphs over the same nodes, build the index once and pass it in,
+# so node names are not suffix-matched again for every edge of every graph.
+
+def intervention_effects(graph, role_index=None):
+    if role_index is not None:
+        return role_index.edges_of_class(graph, "intervention")
+    f = lambda x: x[0].endswith("int")
+    return  [x for x in graph.edges() if f(x)]            
+
+def cause_observation_pairings(graph, role_index=None):
+    if role_index is not None:
+        return role_index.edges_of_class(graph, "cause_observation")
+    f = lambda x: x[0].endswith("★") and x[1].endswith("out")
+    return  [x for x in graph.edges() if f(x)]
+
+def hidden_cause_pairs(graph, role_index=None):
+    if role_index is not None:
+        return role_index.edges_of_class(graph, "hidden_cause")
+    f = lambda x: x[0].endswith("★") and x[1].endswith("★")
+    return [x for x in graph.edges() if f(x)]
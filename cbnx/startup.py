@@ -0,0 +1,61 @@
+"""
+Measuring how long process-pool workers take to start and import what they need.
+
+A worker's startup cost is mostly the modules it imports. measure_worker_startup starts a fresh
+pool (with the "spawn" start method by default, so every worker is a new interpreter), has each worker
+import the given modules, and reports the time taken along with which cbnx submodules and heavy
+dependencies ended up imported, so you can check e.g. that a sampling-only worker did not load
+the enumeration machinery.
+
+    python -m cbnx.startup cbnx.sampling
+"""
+
+import multiprocessing
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+# module name prefixes reported as loaded in the workers
+TRACKED_MODULES = ("cbnx", "networkx", "numpy", "scipy")
+
+
+def _probe(modules):
+    start = time.perf_counter()
+    for module in modules:
+        __import__(module)
+    import_time = time.perf_counter() - start
+    loaded = sorted(name for name in sys.modules if name.split(".")[0] in TRACKED_MODULES
+                    and (name.startswith("cbnx") or "." not in name))
+    return {"import_time": import_time, "loaded": loaded}
+
+
+def measure_worker_startup(modules=("cbnx.sampling",), n_workers=2, start_method="spawn"):
+    """
+    Starts a pool of n_workers processes whose workers each import modules, and returns a dictionary with
+    "startup_time", the seconds from creating the pool until every worker has finished its imports,
+    "import_times", the seconds spent importing modules by each of the n_workers tasks, and
+    "loaded", the cbnx submodules and top-level tracked dependencies (see TRACKED_MODULES) loaded in the first worker.
+
+    Variables:
+    modules is a list of module names to import in each worker, e.g. ["cbnx.sampling"] or ["cbnx.io"].
+    n_workers is the number of worker processes.
+    start_method is the multiprocessing start method, "spawn" measures a cold start.
+    """
+    context = multiprocessing.get_context(start_method)
+    start = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=n_workers, mp_context=context) as executor:
+        results = list(executor.map(_probe, [list(modules)] * n_workers))
+        startup_time = time.perf_counter() - start
+    return {
+        "startup_time": startup_time,
+        "import_times": [result["import_time"] for result in results],
+        "loaded": results[0]["loaded"],
+    }
+
+
+if __name__ == "__main__":
+    modules = sys.argv[1:] or ["cbnx.sampling"]
+    result = measure_worker_startup(modules)
+    print("startup time: {:.3f}s".format(result["startup_time"]))
+    print("import times: {}".format(", ".join("{:.3f}s".format(t) for t in result["import_times"])))
+    print("loaded: {}".format(", ".join(result["loaded"])))
@@ -0,0 +1,407 @@
+"""
+A Metropolis-Hastings sampler over the subgraphs of a graph that meet a list of conditions.
+
+conditionalSubgraphs lists every subgraph of G, which stops being feasible at around 6 nodes
+(completeDiGraph of 6 nodes has 2^36 edge subsets). This sampler instead walks the same space
+with edge moves: add an edge of G, remove an edge, or reverse an edge (when G has the reverse edge).
+
+The chain only ever visits graphs that meet every condition. Conditions made by the factories in
+cbnx.conditions carry a condition_spec, and a move is checked against those incrementally:
+most of them only need to look at the edges the move changes, acyclicity only needs one path search
+per added edge, and path completeness is only rechecked when an edge is removed.
+Any other condition is evaluated on the proposed graph.
+
+The target is pluggable. By default it is uniform over the graphs that meet the conditions,
+otherwise log_target(graph) gives the (unnormalized) log probability of a graph, e.g. a data-driven score.
+"""
+
+import math
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
+import networkx as nx
+import numpy as np
+
+from cbnx.instrumentation import condition_name, get_metrics
+
+MOVES = ("add", "remove", "reverse")
+
+# condition kinds that can be checked before a move is applied, by looking at the changed edges only
+_EDGE_LOCAL_KINDS = {"no_input_node", "no_output_node", "no_direct_arrows", "no_self_loop",
+                     "explicit_parent", "explicit_child"}
+
+
+def _edge_local_violation(kind, args, added, removed):
+    """
+    Returns True if the move that adds the edges in added and removes the edges in removed
+    breaks a condition of an edge-local kind, given that the current graph meets it.
+    """
+    if kind == "no_input_node":
+        return any(child in args for parent, child in added)
+    if kind == "no_output_node":
+        return any(parent in args for parent, child in added)
+    if kind == "no_direct_arrows":
+        return any(edge in args for edge in added)
+    if kind == "no_self_loop":
+        return any(parent == child for parent, child in added)
+    if kind == "explicit_parent":
+        return any(child in args for parent, child in added + removed)
+    if kind == "explicit_child":
+        return any(parent in args for parent, child in added + removed)
+    raise ValueError("{} is not an edge-local condition kind.".format(kind))
+
+
+def _graph_violation(kind, args, graph, added, removed):
+    """
+    Returns True if graph, which a move has just been applied to, breaks a condition of a
+    non edge-local kind, given that the graph before the move met it.
+    """
+    if kind == "is_dag":
+        # adding (u,v) closes a cycle exactly when there already is a path from v to u
+        return any(parent == child or nx.has_path(graph, child, parent) for parent, child in added)
+    if kind == "path_complete":
+        return len(removed) > 0 and not all(nx.has_path(graph, x, y) for x, y in args)
+    raise ValueError("{} is not a known condition kind.".format(kind))
+
+
+def _split_conditions(condition_list):
+    """
+    Splits condition_list into edge-local specs, graph-level specs and opaque conditions
+    (conditions without a condition_spec, which are evaluated in full on every proposal).
+    Each is paired with its condition_name, so rejections can be counted per condition.
+    """
+    edge_local, graph_level, opaque = [], [], []
+    for position, c in enumerate(condition_list):
+        name = condition_name(c, position)
+        spec = getattr(c, "condition_spec", None)
+        if spec is None:
+            opaque.append((name, c))
+        elif spec[0] in _EDGE_LOCAL_KINDS:
+            edge_local.append((name, spec))
+        elif spec[0] in ("is_dag", "path_complete"):
+            graph_level.append((name, spec))
+        else:
+            opaque.append((name, c))
+    return edge_local, graph_level, opaque
+
+
+class _IndexedSet(object):
+    """
+    A set that can also return a uniformly random member in constant time.
+    """
+
+    def __init__(self, items=()):
+        self.items = []
+        self.index = {}
+        for item in items:
+            self.add(item)
+
+    def __len__(self):
+        return len(self.items)
+
+    def __contains__(self, item):
+        return item in self.index
+
+    def add(self, item):
+        if item not in self.index:
+            self.index[item] = len(self.items)
+            self.items.append(item)
+
+    def discard(self, item):
+        i = self.index.pop(item, None)
+        if i is not None:
+            last = self.items.pop()
+            if i < len(self.items):
+                self.items[i] = last
+                self.index[last] = i
+
+    def choice(self, rng):
+        return self.items[rng.integers(len(self.items))]
+
+
+def _initial_graph(G, condition_list, initial):
+    if initial is not None:
+        if not all(G.has_edge(*edge) for edge in initial.edges()):
+            raise ValueError("The initial graph needs to be a subgraph of G.")
+        if not all([c(initial) for c in condition_list]):
+            raise ValueError("The initial graph does not meet every condition in condition_list.")
+        return initial.copy()
+    empty = G.copy()
+    empty.remove_edges_from(G.edges())
+    for graph in (G, empty):
+        if all([c(graph) for c in condition_list]):
+            return graph.copy()
+    raise ValueError("""
+    Neither G nor its empty subgraph meet every condition, pass in an initial graph that does
+    (for instance the first graph from conditionalSubgraphs on a smaller problem).""")
+
+
+def run_chain(G, condition_list, n_steps, initial=None, log_target=None, burn_in=0, thin=1, seed=None):
+    """
+    Runs one Metropolis-Hastings chain over the subgraphs of G that meet every condition in condition_list.
+
+    Each step proposes one of the possible add, remove and reverse moves uniformly at random,
+    rejects it if it breaks a condition, and otherwise accepts it with the Metropolis-Hastings probability
+    for log_target (with the Hastings correction for the number of moves available from each graph).
+
+    Returns a dictionary with
+    "samples", the edge sets (frozensets of edges) recorded every thin steps after burn_in,
+    "trace", an array with the number of edges of each recorded sample,
+    "log_target_trace", an array with the log target of each recorded sample,
+    "proposed", "accepted", "rejected_condition" and "rejected_target", counts per move type, and
+    "rejected_by", counts of rejections per condition, keyed by condition_name (e.g. "0.is_dag_condition").
+
+    Variables:
+    G is the graph whose subgraphs are sampled, e.g. completeDiGraph(nodes) after filters.
+    condition_list is a list of conditions (see the create_*_condition factories).
+    n_steps is the number of proposals, including burn_in.
+    initial is a subgraph of G meeting the conditions to start from, G or its empty subgraph is used if not given.
+    If G has no edges the chain makes no proposals and records its empty subgraph at every step.
+    log_target is a function from a graph to its unnormalized log probability, None for the uniform target.
+    seed seeds the chain's random number generator.
+    """
+    result = _run_chain(G, condition_list, n_steps, initial, log_target, burn_in, thin, seed)
+    metrics = get_metrics()
+    if metrics is not None:
+        _record_chain_metrics(metrics, result)
+    return result
+
+
+def _record_chain_metrics(metrics, result):
+    for move in MOVES:
+        metrics.incr("structure_mcmc.proposed." + move, result["proposed"][move])
+        metrics.incr("structure_mcmc.accepted." + move, result["accepted"][move])
+    for name, count in result["rejected_by"].items():
+        metrics.incr("structure_mcmc.rejected." + name, count)
+
+
+def _run_chain(G, condition_list, n_steps, initial, log_target, burn_in, thin, seed):
+    """
+    run_chain without recording metrics, which sample_structures records itself once the chains are back
+    (a chain run in a worker process would otherwise record into the worker's copy of the metrics).
+    """
+    rng = np.random.default_rng(seed)
+    edge_local, graph_level, opaque = _split_conditions(condition_list)
+
+    graph = _initial_graph(G, condition_list, initial)
+    universe = G.edges()
+    universe_set = set(universe)
+    present = set(graph.edges())
+    reversible = _IndexedSet(
+        (u, v) for u, v in present if u != v and (v, u) in universe_set and (v, u) not in present)
+    current_log_target = 0.0 if log_target is None else log_target(graph)
+
+    stats = {name: dict.fromkeys(MOVES, 0) for name in ("proposed", "accepted", "rejected_condition", "rejected_target")}
+    rejected_by = {}
+    samples, trace, log_target_trace = [], [], []
+
+    def update_reversible(u, v):
+        for edge in ((u, v), (v, u)):
+            x, y = edge
+            if edge in present and x != y and (y, x) in universe_set and (y, x) not in present:
+                reversible.add(edge)
+            else:
+                reversible.discard(edge)
+
+    def reject(move, name):
+        stats["rejected_condition"][move] += 1
+        rejected_by[name] = rejected_by.get(name, 0) + 1
+
+    def record(step):
+        if step >= burn_in and (step - burn_in) % thin == 0:
+            samples.append(frozenset(present))
+            trace.append(len(present))
+            log_target_trace.append(current_log_target)
+
+    for step in range(n_steps):
+        n_moves = len(universe) + len(reversible)
+        if n_moves == 0:
+            # G has no edges, so its empty subgraph is the only state and there is nothing to propose
+            record(step)
+            continue
+        r = rng.integers(n_moves)
+        if r < len(universe):
+            edge = universe[r]
+            if edge in present:
+                move, added, removed = "remove", [], [edge]
+            else:
+                move, added, removed = "add", [edge], []
+        else:
+            edge = reversible.choice(rng)
+            move, added, removed = "reverse", [(edge[1], edge[0])], [edge]
+        stats["proposed"][move] += 1
+
+        violated_name = next((name for name, spec in edge_local
+                              if _edge_local_violation(spec[0], spec[1], added, removed)), None)
+        if violated_name is not None:
+            reject(move, violated_name)
+        else:
+            graph.remove_edges_from(removed)
+            graph.add_edges_from(added)
+            present.difference_update(removed)
+            present.update(added)
+            update_reversible(*edge)
+
+            for name, spec in graph_level:
+                if _graph_violation(spec[0], spec[1], graph, added, removed):
+                    violated_name = name
+                    break
+            if violated_name is None:
+                for name, c in opaque:
+                    if not c(graph):
+                        violated_name = name
+                        break
+
+            accepted = False
+            if violated_name is not None:
+                reject(move, violated_name)
+            else:
+                proposed_log_target = 0.0 if log_target is None else log_target(graph)
+                log_ratio = (proposed_log_target - current_log_target
+                             + math.log(n_moves) - math.log(len(universe) + len(reversible)))
+                if log_ratio >= 0 or rng.random() < math.exp(log_ratio):
+                    accepted = True
+                    current_log_target = proposed_log_target
+                    stats["accepted"][move] += 1
+                else:
+                    stats["rejected_target"][move] += 1
+
+            if not accepted:
+                graph.remove_edges_from(added)
+                graph.add_edges_from(removed)
+                present.difference_update(added)
+                present.update(removed)
+                update_reversible(*edge)
+
+        record(step)
+
+    result = dict(stats)
+    result.update({
+        "samples": samples,
+        "trace": np.array(trace),
+        "log_target_trace": np.array(log_target_trace),
+        "rejected_by": rejected_by,
+    })
+    return result
+
+
+def gelman_rubin(traces):
+    """
+    Returns the Gelman-Rubin potential scale reduction factor (R-hat) for a list of equal-length chain traces.
+    Values close to 1 suggest the chains have converged to the same distribution.
+    R-hat is nan when every chain is constant, and inf when the chains are constant at different values.
+    """
+    traces = np.asarray(traces, dtype=float)
+    m, n = traces.shape
+    if m < 2 or n < 2:
+        return float("nan")
+    within = traces.var(axis=1, ddof=1).mean()
+    between = n * traces.mean(axis=1).var(ddof=1)
+    if within == 0:
+        return float("nan") if between == 0 else float("inf")
+    pooled = (n - 1) / n * within + between / n
+    return float(np.sqrt(pooled / within))
+
+
+def edge_frequencies(G, samples):
+    """
+    Returns an array with the fraction of samples containing each edge of G, in the order of G.edges().
+    """
+    if len(samples) == 0:
+        return np.zeros(len(G.edges()))
+    return np.array([sum(edge in sample for sample in samples) for edge in G.edges()]) / len(samples)
+
+
+def chain_diagnostics(G, chains):
+    """
+    Returns convergence and acceptance diagnostics for a list of run_chain results:
+    "acceptance_rate", overall and per move type, across all chains,
+    "chain_acceptance_rate", the overall acceptance rate of each chain,
+    "r_hat", the Gelman-Rubin statistic for the number of edges and for the log target,
+    "edge_frequencies", a [chain, edge] array of edge marginals (edges in the order of G.edges()), and
+    "max_edge_frequency_difference", the largest difference between chains in any edge's marginal.
+
+    R-hat compares the spread within chains to the spread between them, so for chains that all started
+    from the same graph it understates non-convergence. Start chains from different graphs where you can
+    (see the initial argument of sample_structures).
+    """
+    def rate(accepted, proposed):
+        return accepted / proposed if proposed else float("nan")
+
+    acceptance_rate = {move: rate(sum(c["accepted"][move] for c in chains), sum(c["proposed"][move] for c in chains))
+                       for move in MOVES}
+    acceptance_rate["all"] = rate(sum(sum(c["accepted"].values()) for c in chains),
+                                  sum(sum(c["proposed"].values()) for c in chains))
+    length = min(len(c["trace"]) for c in chains) if chains else 0
+    frequencies = np.array([edge_frequencies(G, c["samples"]) for c in chains])
+    return {
+        "acceptance_rate": acceptance_rate,
+        "chain_acceptance_rate": [rate(sum(c["accepted"].values()), sum(c["proposed"].values())) for c in chains],
+        "r_hat": {
+            "n_edges": gelman_rubin([c["trace"][:length] for c in chains]),
+            "log_target": gelman_rubin([c["log_target_trace"][:length] for c in chains]),
+        },
+        "edge_frequencies": frequencies,
+        "max_edge_frequency_difference": float(np.ptp(frequencies, axis=0).max()) if len(chains) > 1 and frequencies.size else 0.0,
+    }
+
+
+# The arguments of the chains being run by sample_structures. Conditions are closures, which can't be pickled,
+# so worker processes are forked after this is set and read it from here instead.
+_chain_job = None
+
+
+def _run_forked_chain(initial, seed_sequence):
+    G, condition_list, n_steps, log_target, burn_in, thin = _chain_job
+    return _run_chain(G, condition_list, n_steps, initial, log_target, burn_in, thin, seed_sequence)
+
+
+def sample_structures(G, condition_list, n_steps, n_chains=4, n_jobs=1, initial=None, log_target=None,
+                      burn_in=0, thin=1, seed=None):
+    """
+    Runs n_chains independent chains (see run_chain) and returns a dictionary with the list of chain results
+    under "chains" and their diagnostics (see chain_diagnostics) under "diagnostics".
+
+    initial is either one graph that every chain starts from, or a list of n_chains graphs, one per chain.
+    Spreading the starting graphs out makes the R-hat in the diagnostics meaningful.
+
+    With n_jobs > 1 the chains are run in that many worker processes. This needs the "fork" start method
+    (so that conditions and targets, which are usually closures, reach the workers without pickling);
+    where it is not available the chains are run one after another in this process.
+    """
+    global _chain_job
+    if isinstance(initial, (list, tuple)):
+        if len(initial) != n_chains:
+            raise ValueError("initial has {} graphs, one is needed for each of the {} chains.".format(
+                len(initial), n_chains))
+        initials = list(initial)
+    else:
+        initials = [initial] * n_chains
+    seed_sequences = np.random.SeedSequence(seed).spawn(n_chains)
+    if n_jobs > 1 and n_chains > 1 and "fork" in multiprocessing.get_all_start_methods():
+        _chain_job = (G, condition_list, n_steps, log_target, burn_in, thin)
+        try:
+            with ProcessPoolExecutor(max_workers=n_jobs, mp_context=multiprocessing.get_context("fork")) as executor:
+                chains = list(executor.map(_run_forked_chain, initials, seed_sequences))
+        finally:
+            _chain_job = None
+    else:
+        chains = [_run_chain(G, condition_list, n_steps, chain_initial, log_target, burn_in, thin, seed_sequence)
+                  for chain_initial, seed_sequence in zip(initials, seed_sequences)]
+
+    metrics = get_metrics()
+    if metrics is not None:
+        for chain in chains:
+            _record_chain_metrics(metrics, chain)
+    return {"chains": chains, "diagnostics": chain_diagnostics(G, chains)}
+
+
+def graphs_from_edge_sets(G, edge_sets):
+    """
+    Returns a generator of the subgraphs of G with the given edge sets (e.g. the "samples" of a chain),
+    keeping the node and edge attributes of G.
+    """
+    for edges in edge_sets:
+        graph = G.copy()
+        graph.remove_edges_from([edge for edge in G.edges() if edge not in edges])
+        yield graph